@@ -1,5 +1,9 @@
-import qrcode
 import os
+from qr_utils import DEFAULT_SETTINGS, build_qr
+from raster import module_matrix, render
+
+#file extension of every output format; "bits" is the raw packed 1-bit image.
+EXTENSIONS = {"png": "png", "svg": "svg", "bits": "bin"}
 
 def createFolder(directory):
     try:
@@ -10,10 +14,6 @@ def createFolder(directory):
 
 createFolder('./QR Codes/')
 
-qr = qrcode.QRCode(version=1,
-                    error_correction=qrcode.constants.ERROR_CORRECT_L,
-                    box_size=10,
-                    border=1)
 choice = str(input("Text or URL: "))
 choice = choice.upper()
 if choice == "URL":
@@ -21,11 +21,16 @@ if choice == "URL":
 elif choice == "TEXT":
     data = str(input("Enter a text: "))
 
-qr.add_data(data)
-qr.make(fit=True)
-
-img = qr.make_image(fill_color="black", back_color="white")
+matrix = module_matrix(build_qr(data, DEFAULT_SETTINGS))
 
 name = str(input(f"Enter a name for the image: "))
-img.save(f'./QR Codes/{name}.png')
+fmt = str(input("Format (PNG, SVG or BITS): ")).lower() or "png"
+if fmt not in EXTENSIONS:
+    print(f"Unknown format '{fmt}', saving as PNG.")
+    fmt = "png"
+
+img = render(matrix, fmt, DEFAULT_SETTINGS["box_size"], 0,
+             DEFAULT_SETTINGS["fill_color"], DEFAULT_SETTINGS["back_color"])
+with open(f'./QR Codes/{name}.{EXTENSIONS[fmt]}', "wb") as f:
+    f.write(img)
 
@@ -0,0 +1,186 @@
+import os
+import csv
+import json
+import argparse
+import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from qr_utils import normalize_settings, content_hash, build_qr
+from raster import module_matrix, render
+
+
+def read_records(file_path):
+    """
+    Streams label records from a CSV file (with a header row) or a JSONL file.
+
+    Every record needs a "data" field. It may also carry a "name" and any of the
+    settings in qr_utils.DEFAULT_SETTINGS to override the batch defaults.
+
+    Args:
+        file_path (str): Path to a .csv or .jsonl file.
+
+    Yields:
+        tuple: (row number, record dict). Rows of a JSONL file that cannot be parsed
+               are yielded as (row number, exception).
+    """
+    with open(file_path, "r", newline="", encoding="utf-8") as f:
+        if file_path.lower().endswith(".csv"):
+            #the header is line 1, so data rows start at 2 like in a spreadsheet.
+            for row_number, record in enumerate(csv.DictReader(f), start=2):
+                yield row_number, record
+        else:
+            for row_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield row_number, json.loads(line)
+                except ValueError as e:
+                    yield row_number, e
+
+
+def render_to_file(data, settings, file_path, fmt="png"):
+    """
+    Renders one QR code as a PNG or SVG file. The image is written under a temporary name
+    first, so an interrupted run never leaves a truncated file that would be skipped later.
+
+    Args:
+        data (str): Text or URL to encode.
+        settings (dict): Normalized settings.
+        file_path (str): Output path.
+        fmt (str): "png" or "svg".
+    """
+    matrix = module_matrix(build_qr(data, settings))
+    body = render(matrix, fmt, settings["box_size"], 0, settings["fill_color"], settings["back_color"])
+    tmp = file_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, file_path)
+
+
+def _render_job(data, settings, file_path, fmt):
+    try:
+        render_to_file(data, settings, file_path, fmt)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def run_batch(input_path, output_dir, report_path, defaults=None, workers=None, force=False, fmt="png"):
+    """
+    Renders every record of a CSV/JSONL file across a process pool.
+
+    Each image is saved as "<output_dir>/<hash>.<fmt>", where the hash covers the data and
+    all settings, so rerunning the batch skips every label that already exists. Records
+    are read lazily and only a few jobs per worker are queued at a time, so the input
+    can be arbitrarily large. The report CSV lists row, name, status (created, skipped
+    or failed), file and error for every record. A label repeated while its first row
+    is still rendering is reported once that render is done, with the same outcome.
+
+    Args:
+        input_path (str): Path to the .csv or .jsonl input.
+        output_dir (str): Folder receiving the images.
+        report_path (str): Path of the report CSV file.
+        defaults (dict): Settings applied to records that do not override them.
+        workers (int): Number of worker processes, or None for one per CPU.
+        force (bool): If True, render existing images again.
+        fmt (str): "png" or "svg".
+
+    Returns:
+        dict: Number of records per status.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    base = normalize_settings(defaults)
+    counts = {"created": 0, "skipped": 0, "failed": 0}
+
+    with open(report_path, "w", newline="", encoding="utf-8") as report_file, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        report = csv.writer(report_file)
+        report.writerow(["row", "name", "status", "file", "error"])
+        max_pending = workers * 4
+        pending = {}
+        #file path -> [(row number, name), ...] of the repeats of a label being rendered.
+        queued = {}
+
+        def collect(done):
+            for future in done:
+                row_number, name, file_path = pending.pop(future)
+                error = future.result()
+                status = "failed" if error else "created"
+                counts[status] += 1
+                report.writerow([row_number, name, status, "" if error else file_path, error or ""])
+                for repeat_row, repeat_name in queued.pop(file_path):
+                    if error:
+                        counts["failed"] += 1
+                        report.writerow([repeat_row, repeat_name, "failed", "",
+                                         f"Same label as row {row_number}, which failed: {error}"])
+                    else:
+                        counts["skipped"] += 1
+                        report.writerow([repeat_row, repeat_name, "skipped", file_path, ""])
+
+        for row_number, record in read_records(input_path):
+            name = ""
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                name = record.get("name") or ""
+                data = record.get("data")
+                if not data:
+                    raise ValueError("Missing 'data' field.")
+                settings = normalize_settings(record, base)
+                file_path = os.path.join(output_dir, f"{content_hash(data, settings)}.{fmt}")
+            except Exception as e:
+                counts["failed"] += 1
+                report.writerow([row_number, name, "failed", "", f"{type(e).__name__}: {e}"])
+                continue
+
+            #a label repeated in the input is only rendered once.
+            if file_path in queued:
+                queued[file_path].append((row_number, name))
+                continue
+            if not force and os.path.exists(file_path):
+                counts["skipped"] += 1
+                report.writerow([row_number, name, "skipped", file_path, ""])
+                continue
+
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[executor.submit(_render_job, data, settings, file_path, fmt)] = (row_number, name, file_path)
+            queued[file_path] = []
+
+        collect(list(pending))
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate QR codes in bulk from a CSV or JSONL file.")
+    parser.add_argument("input", help="CSV (with a 'data' column) or JSONL file of labels.")
+    parser.add_argument("-o", "--output-dir", default="./QR Codes/", help="Folder for the images.")
+    parser.add_argument("--report", default="batch_report.csv", help="Per-row report CSV file.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU).")
+    parser.add_argument("--force", action="store_true", help="Render images that already exist again.")
+    parser.add_argument("--format", default="png", choices=["png", "svg"], help="Image format.")
+    parser.add_argument("--version", type=int, help="QR version (size), grown automatically if the data does not fit.")
+    parser.add_argument("--error-correction", choices=["L", "M", "Q", "H"], help="Error correction level.")
+    parser.add_argument("--box-size", type=int, help="Pixels per module.")
+    parser.add_argument("--border", type=int, help="Quiet zone width in modules.")
+    args = parser.parse_args()
+
+    defaults = {
+        "version": args.version,
+        "error_correction": args.error_correction,
+        "box_size": args.box_size,
+        "border": args.border,
+    }
+    start = datetime.datetime.now()
+    counts = run_batch(args.input, args.output_dir, args.report, defaults, args.workers, args.force,
+                       args.format)
+    elapsed = (datetime.datetime.now() - start).total_seconds()
+    print(f"{counts['created']} created, {counts['skipped']} skipped, {counts['failed']} failed "
+          f"in {elapsed:.1f}s (report: {args.report})")
+
+
+if __name__ == "__main__":
+    main()
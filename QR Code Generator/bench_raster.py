@@ -0,0 +1,65 @@
+import timeit
+import argparse
+from io import BytesIO
+
+from qrcode.image.svg import SvgPathImage
+
+from qr_utils import normalize_settings, build_qr
+from raster import module_matrix, to_png, to_svg, pack_bits
+
+
+def pil_png(qr, settings):
+    buffer = BytesIO()
+    qr.make_image(fill_color=settings["fill_color"], back_color=settings["back_color"]).save(buffer)
+    return buffer.getvalue()
+
+
+def pil_svg(qr):
+    buffer = BytesIO()
+    qr.make_image(image_factory=SvgPathImage).save(buffer)
+    return buffer.getvalue()
+
+
+def best_time(func, repeat):
+    """
+    Returns the fastest of several timed runs of a function, in microseconds per call.
+
+    Args:
+        func (callable): Function taking no arguments.
+        repeat (int): Calls per run; five runs are made.
+
+    Returns:
+        float: Microseconds per call of the fastest run.
+    """
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare qrcode's image path with the NumPy rasterizer.")
+    parser.add_argument("--versions", default="1,10,25,40", help="Comma separated QR versions to test.")
+    parser.add_argument("--box-size", type=int, default=10, help="Pixels per module.")
+    parser.add_argument("--repeat", type=int, default=20, help="Calls per timed run.")
+    args = parser.parse_args()
+
+    print(f"{'version':>7} {'modules':>7} {'qrcode png':>11} {'raster png':>11} "
+          f"{'qrcode svg':>11} {'raster svg':>11} {'1-bit':>9}   (microseconds per image)")
+    for version in (int(v) for v in args.versions.split(",")):
+        settings = normalize_settings({"version": version, "box_size": args.box_size})
+        #encoding is the same for both paths, so it is done once outside the timings.
+        qr = build_qr("https://example.com/" + "x" * 10, settings)
+        matrix = module_matrix(qr)
+        fill, back = settings["fill_color"], settings["back_color"]
+
+        timings = [
+            best_time(lambda: pil_png(qr, settings), args.repeat),
+            best_time(lambda: to_png(matrix, args.box_size, 0, fill, back), args.repeat),
+            best_time(lambda: pil_svg(qr), args.repeat),
+            best_time(lambda: to_svg(matrix, args.box_size, 0, fill, back), args.repeat),
+            best_time(lambda: pack_bits(matrix, args.box_size), args.repeat),
+        ]
+        print(f"{version:>7} {matrix.shape[0]:>7} " + " ".join(f"{t:>11.0f}" for t in timings[:4])
+              + f" {timings[4]:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import time
+import json
+import argparse
+import threading
+import http.client
+from urllib.parse import urlencode, urlparse
+
+from server import make_server
+
+
+def percentile(sorted_values, fraction):
+    """
+    Returns a percentile of an already sorted list.
+
+    Args:
+        sorted_values (list): Values in ascending order.
+        fraction (float): Percentile between 0 and 1.
+
+    Returns:
+        float: The value at that percentile.
+    """
+    if not sorted_values:
+        return float('nan')
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_client(host, port, paths, requests, latencies, errors):
+    """
+    Sends requests over one keep-alive connection, cycling through the given paths.
+
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+        paths (list): Request paths to cycle through.
+        requests (int): Number of requests to send.
+        latencies (list): Receives the latency of every successful request, in seconds.
+        errors (list): Receives one entry per failed request.
+    """
+    conn = http.client.HTTPConnection(host, port)
+    for i in range(requests):
+        start = time.perf_counter()
+        try:
+            conn.request("GET", paths[i % len(paths)])
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection(host, port)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the QR server.")
+    parser.add_argument("--url", default=None,
+                        help="Base URL of a running server (default: start one in this process).")
+    parser.add_argument("--requests", type=int, default=20000, help="Total number of requests.")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client connections.")
+    parser.add_argument("--labels", type=int, default=100, help="Distinct labels requested (the hot set).")
+    parser.add_argument("--format", default="png", choices=["png", "svg"], help="Image format to request.")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlparse(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        server = make_server(port=0)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    paths = ["/qr?" + urlencode({"data": f"https://example.com/item/{i}", "format": args.format})
+             for i in range(args.labels)]
+    latencies = []
+    errors = []
+    per_client = args.requests // args.clients
+    threads = [threading.Thread(target=run_client, args=(host, port, paths, per_client, latencies, errors))
+               for _ in range(args.clients)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} requests ({len(errors)} errors) in {elapsed:.2f}s "
+          f"-> {len(latencies) / elapsed:.0f} req/s")
+    print(f"latency p50 {percentile(latencies, 0.5) * 1e6:.0f}us, "
+          f"p90 {percentile(latencies, 0.9) * 1e6:.0f}us, "
+          f"p99 {percentile(latencies, 0.99) * 1e6:.0f}us, "
+          f"max {latencies[-1] * 1e6 if latencies else float('nan'):.0f}us")
+
+    conn = http.client.HTTPConnection(host, port)
+    conn.request("GET", "/stats")
+    print("cache:", json.loads(conn.getresponse().read()))
+    conn.close()
+
+    if server:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
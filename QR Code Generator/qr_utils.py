@@ -0,0 +1,85 @@
+import json
+import hashlib
+import qrcode
+
+ERROR_CORRECTION = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
+#same settings the interactive generator has always used.
+DEFAULT_SETTINGS = {
+    "version": 1,
+    "error_correction": "L",
+    "box_size": 10,
+    "border": 1,
+    "fill_color": "black",
+    "back_color": "white",
+}
+
+
+def normalize_settings(overrides=None, base=None):
+    """
+    Merges QR settings over the defaults and checks their values.
+
+    Args:
+        overrides (dict): Settings to apply. Unknown keys and empty values are ignored,
+            so CSV rows with extra columns can be passed as is.
+        base (dict): Settings to start from, or None for DEFAULT_SETTINGS.
+
+    Returns:
+        dict: Complete settings with version, box_size and border as ints.
+    """
+    settings = dict(base or DEFAULT_SETTINGS)
+    for key, value in (overrides or {}).items():
+        if key in DEFAULT_SETTINGS and value not in (None, ""):
+            settings[key] = value
+    for key in ("version", "box_size", "border"):
+        settings[key] = int(settings[key])
+    settings["error_correction"] = str(settings["error_correction"]).upper()
+    if settings["error_correction"] not in ERROR_CORRECTION:
+        raise ValueError(f"Unknown error correction level: {settings['error_correction']}")
+    if not 1 <= settings["version"] <= 40:
+        raise ValueError(f"QR version must be between 1 and 40, got {settings['version']}")
+    if settings["box_size"] < 1:
+        raise ValueError(f"box_size must be at least 1, got {settings['box_size']}")
+    if settings["border"] < 0:
+        raise ValueError(f"border must not be negative, got {settings['border']}")
+    return settings
+
+
+def content_hash(data, settings):
+    """
+    Returns a stable key for a QR code, so identical labels map to the same file.
+
+    Args:
+        data (str): Encoded text or URL.
+        settings (dict): Normalized settings.
+
+    Returns:
+        str: Hex SHA-256 digest of the data and settings.
+    """
+    payload = json.dumps({"data": data, "settings": settings}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_qr(data, settings):
+    """
+    Creates and lays out a QR code.
+
+    Args:
+        data (str): Text or URL to encode.
+        settings (dict): Normalized settings.
+
+    Returns:
+        qrcode.QRCode: The code, with its module matrix computed.
+    """
+    qr = qrcode.QRCode(version=settings["version"],
+                       error_correction=ERROR_CORRECTION[settings["error_correction"]],
+                       box_size=settings["box_size"],
+                       border=settings["border"])
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
@@ -0,0 +1,179 @@
+import zlib
+import struct
+import numpy as np
+from PIL import ImageColor
+
+FORMATS = ("png", "svg", "bits")
+
+
+def module_matrix(qr):
+    """
+    Returns the module matrix of a laid out QR code as a boolean array.
+
+    Args:
+        qr (qrcode.QRCode): Code on which make() has been called.
+
+    Returns:
+        numpy.ndarray: 2D bool array, True for dark modules, including the code's border.
+    """
+    return np.array(qr.get_matrix(), dtype=bool)
+
+
+def rasterize(matrix, box_size=10, border=0):
+    """
+    Expands a module matrix to one pixel per image point.
+
+    Every module becomes a box_size x box_size block through a broadcast view, so the
+    only allocation is the final image.
+
+    Args:
+        matrix (numpy.ndarray): 2D bool array of modules, e.g. from module_matrix().
+        box_size (int): Pixels per module.
+        border (int): Extra quiet-zone modules to add around the matrix. get_matrix()
+            already includes the code's own border, so this is usually 0.
+
+    Returns:
+        numpy.ndarray: 2D bool array of shape (rows * box_size, cols * box_size).
+    """
+    if border:
+        matrix = np.pad(matrix, border, constant_values=False)
+    rows, cols = matrix.shape
+    blocks = np.broadcast_to(matrix[:, None, :, None], (rows, box_size, cols, box_size))
+    return blocks.reshape(rows * box_size, cols * box_size)
+
+
+def pack_bits(matrix, box_size=10, border=0):
+    """
+    Renders a module matrix as a packed 1-bit image, 8 pixels per byte (MSB first).
+
+    Columns are expanded and packed once per module row, and the packed rows are then
+    repeated, so the full-resolution bool image is never built.
+
+    Args:
+        matrix (numpy.ndarray): 2D bool array of modules.
+        box_size (int): Pixels per module.
+        border (int): Extra quiet-zone modules to add around the matrix.
+
+    Returns:
+        numpy.ndarray: uint8 array of shape (rows * box_size, ceil(cols * box_size / 8)),
+                       with set bits for dark pixels.
+    """
+    if border:
+        matrix = np.pad(matrix, border, constant_values=False)
+    packed_rows = np.packbits(np.repeat(matrix, box_size, axis=1), axis=1)
+    return np.repeat(packed_rows, box_size, axis=0)
+
+
+def to_png(matrix, box_size=10, border=0, fill_color="black", back_color="white", level=6):
+    """
+    Encodes a module matrix as a 1-bit palette PNG, entirely in memory.
+
+    Args:
+        matrix (numpy.ndarray): 2D bool array of modules.
+        box_size (int): Pixels per module.
+        border (int): Extra quiet-zone modules to add around the matrix.
+        fill_color: Color of dark modules, in any form accepted by parse_color().
+        back_color: Background color, in the same forms.
+        level (int): zlib compression level.
+
+    Returns:
+        bytes: The PNG file.
+    """
+    if border:
+        matrix = np.pad(matrix, border, constant_values=False)
+    rows, cols = matrix.shape
+    width = cols * box_size
+    packed_rows = np.packbits(np.repeat(matrix, box_size, axis=1), axis=1)
+    #every PNG scanline starts with its filter type; 0 means unfiltered.
+    scanlines = np.zeros((rows, packed_rows.shape[1] + 1), dtype=np.uint8)
+    scanlines[:, 1:] = packed_rows
+    raw = np.repeat(scanlines, box_size, axis=0)
+
+    header = struct.pack(">IIBBBBB", width, rows * box_size, 1, 3, 0, 0, 0)
+    palette = bytes(parse_color(back_color) + parse_color(fill_color))
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", header),
+        _png_chunk(b"PLTE", palette),
+        _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), level)),
+        _png_chunk(b"IEND", b""),
+    ])
+
+
+def to_svg(matrix, box_size=10, border=0, fill_color="black", back_color="white"):
+    """
+    Encodes a module matrix as an SVG image with one path of horizontal runs.
+
+    Args:
+        matrix (numpy.ndarray): 2D bool array of modules.
+        box_size (int): Pixels per module, used for the width and height.
+        border (int): Extra quiet-zone modules to add around the matrix.
+        fill_color: Color of dark modules, in any form accepted by parse_color().
+        back_color: Background color, in the same forms.
+
+    Returns:
+        bytes: The SVG document, UTF-8 encoded.
+    """
+    if border:
+        matrix = np.pad(matrix, border, constant_values=False)
+    rows, cols = matrix.shape
+    #a run starts where a dark module follows a light one and ends at the next light one.
+    edges = np.diff(np.pad(matrix, ((0, 0), (1, 1)), constant_values=False).astype(np.int8), axis=1)
+    run_rows, run_starts = np.nonzero(edges == 1)
+    run_ends = np.nonzero(edges == -1)[1]
+    path = "".join(f"M{x},{y}h{n}v1h-{n}z"
+                   for y, x, n in zip(run_rows.tolist(), run_starts.tolist(),
+                                      (run_ends - run_starts).tolist()))
+    svg = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{cols * box_size}" '
+           f'height="{rows * box_size}" viewBox="0 0 {cols} {rows}" shape-rendering="crispEdges">'
+           f'<rect width="{cols}" height="{rows}" fill="{_hex(back_color)}"/>'
+           f'<path d="{path}" fill="{_hex(fill_color)}"/></svg>')
+    return svg.encode("utf-8")
+
+
+def render(matrix, fmt="png", box_size=10, border=0, fill_color="black", back_color="white"):
+    """
+    Encodes a module matrix in one of the supported formats.
+
+    Args:
+        matrix (numpy.ndarray): 2D bool array of modules.
+        fmt (str): "png", "svg" or "bits" (the raw bytes of pack_bits()).
+        box_size (int): Pixels per module.
+        border (int): Extra quiet-zone modules to add around the matrix.
+        fill_color: Color of dark modules.
+        back_color: Background color.
+
+    Returns:
+        bytes: The encoded image.
+    """
+    if fmt == "png":
+        return to_png(matrix, box_size, border, fill_color, back_color)
+    if fmt == "svg":
+        return to_svg(matrix, box_size, border, fill_color, back_color)
+    if fmt == "bits":
+        return pack_bits(matrix, box_size, border).tobytes()
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def parse_color(color):
+    """
+    Converts any color PIL understands (a name, "#rrggbb", "rgb(0,0,255)", ...) or an
+    (r, g, b) tuple to an RGB tuple, so the same colors work as with qr.make_image().
+
+    Args:
+        color: The color to convert.
+
+    Returns:
+        tuple: (r, g, b) ints between 0 and 255.
+    """
+    if isinstance(color, (tuple, list)):
+        return tuple(int(c) for c in color[:3])
+    return ImageColor.getrgb(str(color).strip())[:3]
+
+
+def _hex(color):
+    return "#%02x%02x%02x" % parse_color(color)
+
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
@@ -0,0 +1,197 @@
+import json
+import argparse
+import functools
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from qrcode.exceptions import DataOverflowError
+
+from qr_utils import DEFAULT_SETTINGS, normalize_settings, content_hash, build_qr
+from raster import module_matrix, render
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+
+class QRRenderer:
+    """
+    Renders QR codes to image bytes, keeping the most recently used results in memory.
+
+    Two LRU caches are used: one for the module matrices (the expensive data encoding
+    and error correction step), keyed by data and settings, and one for the final image
+    bytes, keyed by data, settings and format. A PNG and an SVG of the same label
+    therefore share one encoding. Images are drawn from the matrix by raster.py.
+
+    lru_cache does not hold a lock while computing a missing value, so concurrent first
+    requests for one label would all render it. Lookups are therefore serialized per
+    label through a fixed set of locks: the first request renders, the others wait and
+    then hit the cache.
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(self, max_images=4096, max_codes=4096):
+        """
+        Args:
+            max_images (int): Number of rendered images kept in memory.
+            max_codes (int): Number of module matrices kept in memory.
+        """
+        self._encode = functools.lru_cache(maxsize=max_codes)(self._encode_uncached)
+        self._render = functools.lru_cache(maxsize=max_images)(self._render_uncached)
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+
+    def render(self, data, settings, fmt="png"):
+        """
+        Returns the image of a QR code.
+
+        Args:
+            data (str): Text or URL to encode.
+            settings (dict): Normalized settings.
+            fmt (str): "png" or "svg".
+
+        Returns:
+            bytes: The encoded image.
+        """
+        if fmt not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported format: {fmt}")
+        settings_key = tuple(sorted(settings.items()))
+        #keyed without the format, so a PNG and an SVG of one label do not encode it twice.
+        with self._locks[hash((data, settings_key)) % self.LOCK_STRIPES]:
+            return self._render(data, settings_key, fmt)
+
+    def cache_info(self):
+        """
+        Returns:
+            dict: Hits, misses and sizes of the image and code caches.
+        """
+        return {"images": self._render.cache_info()._asdict(),
+                "codes": self._encode.cache_info()._asdict()}
+
+    def _encode_uncached(self, data, settings_key):
+        matrix = module_matrix(build_qr(data, dict(settings_key)))
+        #cached matrices are shared between threads.
+        matrix.flags.writeable = False
+        return matrix
+
+    def _render_uncached(self, data, settings_key, fmt):
+        settings = dict(settings_key)
+        matrix = self._encode(data, settings_key)
+        return render(matrix, fmt, settings["box_size"], 0, settings["fill_color"], settings["back_color"])
+
+
+class QRRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves GET /qr?data=...&format=png|svg plus any setting from DEFAULT_SETTINGS as a
+    query parameter, and GET /stats with the cache counters.
+    """
+
+    #keep-alive lets clients reuse one connection for many labels.
+    protocol_version = "HTTP/1.1"
+    #headers and body go out as separate writes; with Nagle on, each response waits ~40ms for an ACK.
+    disable_nagle_algorithm = True
+    renderer = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stats":
+            self._send(200, "application/json", json.dumps(self.renderer.cache_info()).encode("utf-8"))
+            return
+        if url.path != "/qr":
+            self._send(404, "text/plain", b"Not found\n")
+            return
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        data = query.get("data")
+        fmt = query.get("format", "png").lower()
+        if not data:
+            self._send(400, "text/plain", b"Missing 'data' parameter\n")
+            return
+        try:
+            settings = normalize_settings(query)
+            #every request is cached, so oversized images would pin large buffers in memory.
+            if settings["box_size"] > self.server.max_box_size:
+                raise ValueError(f"box_size must be at most {self.server.max_box_size}")
+            if settings["border"] > self.server.max_border:
+                raise ValueError(f"border must be at most {self.server.max_border}")
+            etag = '"' + content_hash(data, dict(settings, format=fmt)) + '"'
+            #clients that already hold this image get an empty reply without any rendering.
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, None, b"", etag)
+                return
+            body = self.renderer.render(data, settings, fmt)
+        except (ValueError, DataOverflowError) as e:
+            self._send(400, "text/plain", f"{e}\n".encode("utf-8"))
+            return
+        self._send(200, CONTENT_TYPES[fmt], body, etag)
+
+    def _send(self, status, content_type, body, etag=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "public, max-age=86400")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        #per-request logging to stderr would dominate the cost of a cached response.
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8000, max_images=4096, max_codes=4096, quiet=True,
+                max_box_size=50, max_border=20):
+    """
+    Creates the QR HTTP server without starting it.
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port to listen on, or 0 to pick a free one.
+        max_images (int): Number of rendered images kept in memory.
+        max_codes (int): Number of encoded codes kept in memory.
+        quiet (bool): If True, do not log every request.
+        max_box_size (int): Largest box_size accepted; larger requests get a 400 reply.
+        max_border (int): Largest border accepted; larger requests get a 400 reply.
+
+    Returns:
+        ThreadingHTTPServer: Server ready for serve_forever().
+    """
+    handler = type("Handler", (QRRequestHandler,), {"renderer": QRRenderer(max_images, max_codes)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    server.max_box_size = max_box_size
+    server.max_border = max_border
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve QR codes over HTTP from an in-memory cache.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on.")
+    parser.add_argument("--max-images", type=int, default=4096, help="Rendered images kept in memory.")
+    parser.add_argument("--max-codes", type=int, default=4096, help="Encoded codes kept in memory.")
+    parser.add_argument("--max-box-size", type=int, default=50, help="Largest box_size a request may ask for.")
+    parser.add_argument("--max-border", type=int, default=20, help="Largest border a request may ask for.")
+    parser.add_argument("--log", action="store_true", help="Log every request.")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.max_images, args.max_codes, quiet=not args.log,
+                         max_box_size=args.max_box_size, max_border=args.max_border)
+    host, port = server.server_address[:2]
+    print(f"Serving QR codes on http://{host}:{port}/qr?data=... (defaults: {DEFAULT_SETTINGS})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
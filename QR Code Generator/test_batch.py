@@ -0,0 +1,75 @@
+import csv
+import json
+import os
+
+from batch import run_batch
+
+URL = "https://github.com/MKarthihan/Projects"
+#more than a version 40 code holds at error correction level H.
+TOO_LONG = "x" * 4000
+
+
+def _run(tmp_path, name, lines, **kwargs):
+    input_path = tmp_path / name
+    input_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    report_path = tmp_path / "report.csv"
+    counts = run_batch(str(input_path), str(tmp_path / "out"), str(report_path), workers=1, **kwargs)
+    with open(report_path, newline="", encoding="utf-8") as f:
+        rows = {int(row["row"]): row for row in csv.DictReader(f)}
+    return counts, rows
+
+
+def test_repeated_label_gets_first_row_outcome(tmp_path):
+    lines = ["data,name,error_correction",
+             f"{URL},first,L",
+             f"{URL},again,L",
+             f"{TOO_LONG},big,H",
+             f"{TOO_LONG},big again,H"]
+    counts, rows = _run(tmp_path, "labels.csv", lines)
+    assert counts == {"created": 1, "skipped": 1, "failed": 2}
+
+    assert rows[2]["status"] == "created"
+    assert rows[3]["status"] == "skipped"
+    assert rows[3]["file"] == rows[2]["file"]
+    assert os.path.exists(rows[2]["file"])
+
+    assert rows[4]["status"] == "failed"
+    assert "version" in rows[4]["error"]
+    assert rows[5]["status"] == "failed"
+    assert rows[5]["file"] == ""
+    assert rows[5]["error"] == f"Same label as row 4, which failed: {rows[4]['error']}"
+
+
+def test_rerun_skips_existing_files(tmp_path):
+    lines = [json.dumps({"data": URL}), json.dumps({"data": URL, "box_size": 4})]
+    counts, first = _run(tmp_path, "labels.jsonl", lines)
+    assert counts == {"created": 2, "skipped": 0, "failed": 0}
+
+    counts, second = _run(tmp_path, "labels.jsonl", lines)
+    assert counts == {"created": 0, "skipped": 2, "failed": 0}
+    assert [row["file"] for row in second.values()] == [row["file"] for row in first.values()]
+
+    counts, _ = _run(tmp_path, "labels.jsonl", lines, force=True)
+    assert counts == {"created": 2, "skipped": 0, "failed": 0}
+
+
+def test_bad_jsonl_line_is_reported(tmp_path):
+    lines = [json.dumps({"data": URL, "name": "ok"}), "{not json", "", json.dumps({"name": "empty"})]
+    counts, rows = _run(tmp_path, "labels.jsonl", lines)
+    assert counts == {"created": 1, "skipped": 0, "failed": 2}
+    assert rows[1]["status"] == "created"
+    assert rows[2]["status"] == "failed"
+    assert rows[2]["error"].startswith("JSONDecodeError")
+    assert 3 not in rows
+    assert rows[4]["name"] == "empty"
+    assert rows[4]["error"] == "ValueError: Missing 'data' field."
+
+
+def test_invalid_box_size_is_reported(tmp_path):
+    lines = ["data,box_size", f"{URL},0", f"{URL},big", f"{URL},3"]
+    counts, rows = _run(tmp_path, "labels.csv", lines)
+    assert counts == {"created": 1, "skipped": 0, "failed": 2}
+    assert rows[2]["error"] == "ValueError: box_size must be at least 1, got 0"
+    assert rows[3]["error"].startswith("ValueError")
+    assert rows[2]["file"] == rows[3]["file"] == ""
+    assert rows[4]["status"] == "created"
@@ -0,0 +1,54 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from qr_utils import normalize_settings, build_qr
+from raster import module_matrix, rasterize, pack_bits, to_png, to_svg, parse_color
+
+
+def _qr(version, box_size, border=1):
+    settings = normalize_settings({"version": version, "box_size": box_size, "border": border})
+    return build_qr("https://github.com/MKarthihan/Projects", settings)
+
+
+#box sizes 3 and 5 give row widths that are not a multiple of 8.
+@pytest.mark.parametrize("version, box_size", [(1, 3), (1, 10), (7, 5), (25, 1), (40, 3)])
+def test_png_matches_make_image(version, box_size):
+    qr = _qr(version, box_size)
+    expected = np.array(qr.make_image(fill_color="black", back_color="white").get_image().convert("L"))
+
+    img = Image.open(BytesIO(to_png(module_matrix(qr), box_size, 0)))
+    actual = np.array(img.convert("L"))
+    assert img.size == (expected.shape[1], expected.shape[0])
+    assert np.array_equal(actual, expected)
+
+
+def test_png_uses_requested_colors():
+    qr = _qr(2, 4)
+    matrix = module_matrix(qr)
+    img = np.array(Image.open(BytesIO(to_png(matrix, 4, 0, "navy", "rgb(255,165,0)"))).convert("RGB"))
+    dark = rasterize(matrix, 4)
+    assert (img[dark] == parse_color("navy")).all()
+    assert (img[~dark] == (255, 165, 0)).all()
+
+
+@pytest.mark.parametrize("box_size, border", [(3, 0), (5, 2), (8, 0), (1, 4)])
+def test_pack_bits_unpacks_to_rasterize(box_size, border):
+    matrix = module_matrix(_qr(3, box_size))
+    image = rasterize(matrix, box_size, border)
+    unpacked = np.unpackbits(pack_bits(matrix, box_size, border), axis=1, count=image.shape[1])
+    assert np.array_equal(unpacked.astype(bool), image)
+
+
+def test_svg_covers_every_dark_module():
+    matrix = module_matrix(_qr(4, 2))
+    svg = to_svg(matrix, 2).decode("utf-8")
+    path = svg.split(' d="')[1].split('"')[0]
+    drawn = np.zeros_like(matrix)
+    for run in path.split("z")[:-1]:
+        position, rest = run[1:].split("h", 1)
+        x, y = (int(v) for v in position.split(","))
+        drawn[y, x:x + int(rest.split("v")[0])] = True
+    assert np.array_equal(drawn, matrix)
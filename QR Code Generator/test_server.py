@@ -0,0 +1,104 @@
+import json
+import threading
+import http.client
+from urllib.parse import urlencode
+
+import pytest
+
+from qr_utils import normalize_settings
+from server import QRRenderer, make_server
+
+URL = "https://github.com/MKarthihan/Projects"
+
+
+@pytest.fixture
+def server():
+    server = make_server(port=0, max_box_size=20)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, params=None, path="/qr", headers=None):
+    host, port = server.server_address[:2]
+    conn = http.client.HTTPConnection(host, port)
+    try:
+        conn.request("GET", path + ("?" + urlencode(params) if params else ""), headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def _stats(server):
+    return json.loads(_get(server, path="/stats")[2])
+
+
+@pytest.mark.parametrize("params, message", [
+    ({"data": URL, "box_size": 21}, b"box_size must be at most 20"),
+    ({"data": URL, "border": 21}, b"border must be at most 20"),
+    ({"data": URL, "version": 41}, b"QR version must be between 1 and 40"),
+    ({"data": URL, "version": "big"}, b"invalid literal"),
+    ({"data": URL, "fill_color": "not-a-color"}, b"color"),
+    ({"data": URL, "format": "gif"}, b"Unsupported format: gif"),
+    ({"box_size": 4}, b"Missing 'data' parameter"),
+])
+def test_bad_requests_get_400(server, params, message):
+    status, _, body = _get(server, params)
+    assert status == 400
+    assert message in body
+    assert _stats(server)["images"]["currsize"] == 0
+
+
+def test_if_none_match_gets_304(server):
+    status, headers, body = _get(server, {"data": URL, "format": "svg"})
+    assert status == 200
+    assert headers["Content-Type"] == "image/svg+xml"
+    assert body.startswith(b"<svg")
+
+    status, _, body = _get(server, {"data": URL, "format": "svg"}, headers={"If-None-Match": headers["ETag"]})
+    assert status == 304
+    assert body == b""
+    assert _stats(server)["images"]["hits"] == 0
+
+    #another format has another tag.
+    status, _, _ = _get(server, {"data": URL}, headers={"If-None-Match": headers["ETag"]})
+    assert status == 200
+
+
+def test_stats_report_cache_hits(server):
+    first = _get(server, {"data": URL, "box_size": 4})
+    second = _get(server, {"data": URL, "box_size": 4})
+    assert first[0] == second[0] == 200
+    assert first[2] == second[2]
+    _get(server, {"data": URL, "box_size": 4, "format": "svg"})
+
+    stats = _stats(server)
+    assert stats["images"]["hits"] == 1
+    assert stats["images"]["misses"] == 2
+    assert stats["codes"]["hits"] == 1
+    assert stats["codes"]["misses"] == 1
+
+
+def test_concurrent_first_requests_render_once():
+    renderer = QRRenderer()
+    labels = [f"{URL}/{i}" for i in range(20)]
+    settings = normalize_settings()
+    barrier = threading.Barrier(4)
+
+    def client():
+        barrier.wait()
+        for label in labels:
+            renderer.render(label, settings)
+
+    threads = [threading.Thread(target=client) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    info = renderer.cache_info()
+    assert info["images"]["misses"] == len(labels)
+    assert info["images"]["hits"] == 3 * len(labels)
+    assert info["codes"]["misses"] == len(labels)
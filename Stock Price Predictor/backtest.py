@@ -0,0 +1,180 @@
+import os
+import argparse
+import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from data import PriceCache, QuandlProvider, LocalFileProvider, read_tickers
+
+_cache = None
+
+
+def walk_forward(df, forecast=30, train_window=1260, step=21, expanding=False):
+    """
+    Walk-forward backtest of the `forecast`-day shifted regression.
+
+    The history is cut into consecutive test blocks of `step` samples. Each block is
+    predicted by a model fitted only on samples whose target was already known when the
+    block starts, i.e. training stops `forecast` samples before the first test sample,
+    so no future price leaks into training. Training windows are either the last
+    `train_window` samples (rolling) or everything since the start (expanding).
+
+    All windows are fitted at once from cumulative sums of x, y, x*x and x*y, and the
+    test blocks are gathered with a strided view, so there is no per-window Python loop.
+
+    Args:
+        df (pandas.DataFrame): Price history with an 'Adj. Close' column, indexed by date.
+        forecast (int): Number of days predicted ahead.
+        train_window (int): Training samples per window (minimum size when expanding).
+        step (int): Test samples per window; the model is refitted every `step` days.
+        expanding (bool): If True, every window trains on all samples since the start.
+
+    Returns:
+        pandas.DataFrame: One row per window, indexed by the date of its first test sample,
+                          with train_start, train_end, test_end, slope, intercept, mae,
+                          rmse, mape, r2 and hit_rate columns.
+    """
+    close = df['Adj. Close'].to_numpy(dtype=np.float64)
+    x = close[:-forecast]
+    y = close[forecast:]
+    m = len(x)
+
+    #end (exclusive) of each training window; a window is kept only if its test block is complete.
+    train_end = np.arange(train_window, m - forecast - step + 2, step)
+    if len(train_end) == 0:
+        raise ValueError(f"Need at least {train_window + 2 * forecast + step - 1} rows of history.")
+    train_start = np.zeros_like(train_end) if expanding else train_end - train_window
+    test_start = train_end + forecast - 1
+
+    #least squares is shift invariant, so centring first keeps the cumulative sums well conditioned.
+    x_mean = x.mean()
+    y_mean = y.mean()
+    xc = x - x_mean
+    yc = y - y_mean
+    sums = np.zeros((4, m + 1))
+    np.cumsum(xc, out=sums[0, 1:])
+    np.cumsum(yc, out=sums[1, 1:])
+    np.cumsum(xc * xc, out=sums[2, 1:])
+    np.cumsum(xc * yc, out=sums[3, 1:])
+    sx, sy, sxx, sxy = sums[:, train_end] - sums[:, train_start]
+
+    n = (train_end - train_start).astype(np.float64)
+    var = sxx - sx * sx / n
+    cov = sxy - sx * sy / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(var > 0, cov / var, 0.0)
+    intercept = (sy - slope * sx) / n + y_mean - slope * x_mean
+
+    x_test = sliding_window_view(x, step)[test_start]
+    y_test = sliding_window_view(y, step)[test_start]
+    predicted = intercept[:, None] + slope[:, None] * x_test
+    error = y_test - predicted
+
+    mae = np.abs(error).mean(axis=1)
+    rmse = np.sqrt((error * error).mean(axis=1))
+    mape = (np.abs(error) / np.abs(y_test)).mean(axis=1) * 100
+    ss_res = (error * error).sum(axis=1)
+    ss_tot = ((y_test - y_test.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.nan)
+    #share of test samples where the predicted move has the same sign as the real one.
+    hit_rate = (np.sign(predicted - x_test) == np.sign(y_test - x_test)).mean(axis=1)
+
+    dates = df.index
+    return pd.DataFrame({
+        "train_start": dates[train_start],
+        "train_end": dates[train_end - 1],
+        "test_end": dates[test_start + step - 1],
+        "slope": slope,
+        "intercept": intercept,
+        "mae": mae,
+        "rmse": rmse,
+        "mape": mape,
+        "r2": r2,
+        "hit_rate": hit_rate,
+    }, index=pd.Index(dates[test_start], name="test_start"))
+
+
+def summarize(results):
+    """
+    Averages the error metrics of a walk-forward backtest.
+
+    Args:
+        results (pandas.DataFrame): Output of walk_forward().
+
+    Returns:
+        dict: Mean mae, rmse, mape, r2 and hit_rate, plus the number of windows.
+    """
+    summary = results[["mae", "rmse", "mape", "r2", "hit_rate"]].mean().to_dict()
+    summary["windows"] = len(results)
+    return summary
+
+
+def _init_worker(cache_dir, provider):
+    global _cache
+    _cache = PriceCache(cache_dir, provider)
+
+
+def backtest_ticker(ticker, forecast=30, train_window=1260, step=21, expanding=False):
+    """
+    Runs walk_forward() on one ticker from the worker's cache.
+
+    Returns:
+        tuple: (ticker, results DataFrame or None, error message or None).
+    """
+    try:
+        results = walk_forward(_cache.get(ticker), forecast, train_window, step, expanding)
+        results.insert(0, "ticker", ticker)
+        return ticker, results, None
+    except Exception as e:
+        return ticker, None, f"{type(e).__name__}: {e}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the forecast model.")
+    parser.add_argument("tickers", help="File with one ticker per line, e.g. WIKI/NKE.")
+    parser.add_argument("-o", "--output", default="backtest.csv", help="Per-window results CSV file.")
+    parser.add_argument("--forecast", type=int, default=30, help="Days to predict ahead.")
+    parser.add_argument("--train-window", type=int, default=1260, help="Training days per window.")
+    parser.add_argument("--step", type=int, default=21, help="Days between refits (test block size).")
+    parser.add_argument("--expanding", action="store_true", help="Train on all history up to each window.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU).")
+    parser.add_argument("--cache-dir", default="./Price Cache/", help="Price cache folder.")
+    parser.add_argument("--data-dir", default=None, help="Read '<ticker>.csv' files from this folder instead of quandl.")
+    parser.add_argument("--api-key", default=os.environ.get("QUANDL_API_KEY"), help="Quandl API key.")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        provider = LocalFileProvider(args.data_dir)
+    else:
+        provider = QuandlProvider(args.api_key)
+
+    tickers = read_tickers(args.tickers)
+    start = datetime.datetime.now()
+    header = True
+    with open(args.output, "w", newline="") as f, \
+            ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                initargs=(args.cache_dir, provider)) as executor:
+        futures = [executor.submit(backtest_ticker, ticker, args.forecast, args.train_window,
+                                   args.step, args.expanding)
+                   for ticker in tickers]
+        for future in as_completed(futures):
+            ticker, results, error = future.result()
+            if error:
+                print(f"{ticker}: {error}")
+                continue
+            results.to_csv(f, header=header)
+            header = False
+            summary = summarize(results)
+            print(f"{ticker}: {summary['windows']} windows, MAE {summary['mae']:.3f}, "
+                  f"RMSE {summary['rmse']:.3f}, MAPE {summary['mape']:.2f}%, "
+                  f"R^2 {summary['r2']:.3f}, hit rate {summary['hit_rate']:.2%}")
+    elapsed = (datetime.datetime.now() - start).total_seconds()
+    print(f"Backtested {len(tickers)} tickers in {elapsed:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import os
+import json
+import datetime
+import numpy as np
+import pandas as pd
+
+
+def read_tickers(file_path):
+    """
+    Reads a list of tickers, one per line. Blank lines and lines starting with "#" are ignored.
+
+    Args:
+        file_path (str): Path to the tickers file.
+
+    Returns:
+        list: Ticker strings in file order.
+    """
+    tickers = []
+    with open(file_path, "r") as f:
+        for line in f:
+            line = line.split("#")[0].strip()
+            if line:
+                tickers.append(line)
+    return tickers
+
+
+class QuandlProvider:
+    """
+    Downloads daily price history from Quandl.
+
+    Attributes:
+        api_key (str): Quandl API key, or None to use the key already configured.
+    """
+
+    def __init__(self, api_key=None):
+        """
+        Args:
+            api_key (str): Quandl API key.
+        """
+        self.api_key = api_key
+
+    def fetch(self, ticker, start=None, end=None):
+        """
+        Fetches the rows of a dataset between two dates (inclusive).
+
+        Args:
+            ticker (str): Quandl dataset code, e.g. "WIKI/NKE".
+            start (datetime.date): First date to fetch, or None for the beginning of the dataset.
+            end (datetime.date): Last date to fetch, or None for the latest available row.
+
+        Returns:
+            pandas.DataFrame: Price rows indexed by date.
+        """
+        #imported here so cached and local-file runs work without quandl installed.
+        import quandl
+        if self.api_key:
+            quandl.ApiConfig.api_key = self.api_key
+        kwargs = {}
+        if start is not None:
+            kwargs["start_date"] = start.isoformat()
+        if end is not None:
+            kwargs["end_date"] = end.isoformat()
+        return quandl.get(ticker, **kwargs)
+
+
+class LocalFileProvider:
+    """
+    Reads price history from CSV files on disk, as a drop-in replacement for QuandlProvider.
+
+    Each ticker is stored as "<directory>/<ticker>.csv" (with "/" in the ticker replaced
+    by "_") and must contain a "Date" column followed by the price columns.
+
+    Attributes:
+        directory (str): Folder containing the CSV files.
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Folder containing the CSV files.
+        """
+        self.directory = directory
+
+    def fetch(self, ticker, start=None, end=None):
+        """
+        Reads the rows of a ticker's CSV file between two dates (inclusive).
+
+        Args:
+            ticker (str): Ticker or dataset code.
+            start (datetime.date): First date to return, or None for no lower bound.
+            end (datetime.date): Last date to return, or None for no upper bound.
+
+        Returns:
+            pandas.DataFrame: Price rows indexed by date.
+        """
+        path = os.path.join(self.directory, _ticker_key(ticker) + ".csv")
+        df = pd.read_csv(path, index_col="Date", parse_dates=True).sort_index()
+        return _slice(df, start, end)
+
+
+class PriceCache:
+    """
+    Columnar on-disk cache of daily price history, keyed by ticker.
+
+    Every ticker gets its own folder holding the dates and the price columns as
+    ".npy" arrays plus a small "meta.json" describing the covered date range. Cached
+    arrays are memory-mapped when nothing has to be fetched, so a warm cache loads
+    without parsing anything.
+    Only the date ranges missing from the cache are requested from the provider.
+
+    Attributes:
+        cache_dir (str): Root folder of the cache.
+        provider: Object with a fetch(ticker, start, end) method returning a DataFrame.
+    """
+
+    def __init__(self, cache_dir, provider):
+        """
+        Args:
+            cache_dir (str): Root folder of the cache. Created if it does not exist.
+            provider: Data source used to fill the cache (e.g. QuandlProvider, LocalFileProvider).
+        """
+        self.cache_dir = cache_dir
+        self.provider = provider
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, ticker, start=None, end=None, refresh=False):
+        """
+        Returns the price history of a ticker, fetching only the missing date ranges.
+
+        Adjusted columns are rewritten backwards by the provider after every split or
+        dividend, so newer rows are fetched starting from the last cached row. If that
+        overlapping row no longer matches the cached one, the cached history is stale and
+        the whole range is downloaded again instead of appending to it.
+
+        Args:
+            ticker (str): Ticker or dataset code, e.g. "WIKI/NKE".
+            start (datetime.date): First date wanted, or None for everything cached.
+            end (datetime.date): Last date wanted, or None for everything cached.
+            refresh (bool): If True, also ask the provider for rows newer than the cached range.
+
+        Returns:
+            pandas.DataFrame: Price rows indexed by date.
+        """
+        start = _to_date(start)
+        end = _to_date(end)
+        meta = self._load_meta(ticker)
+
+        if meta is None:
+            df = self.provider.fetch(ticker, start, end)
+            self._store(ticker, df, start, end)
+            return df
+
+        covered_start = _to_date(meta["start"])
+        covered_end = _to_date(meta["end"])
+        #a start of None in the meta means the cache already holds the history from the
+        #first available row.
+        need_head = covered_start is not None and (start is None or start < covered_start)
+        need_tail = covered_end is not None and (refresh or (end is not None and end > covered_end))
+
+        #the cache is rewritten whenever something is fetched, and an open memory map would
+        #block replacing its files on Windows, so only untouched tickers are mapped.
+        df = self._load_frame(ticker, meta, mmap=not (need_head or need_tail))
+        if need_tail and len(df) and end is not None and end <= df.index[-1].date():
+            need_tail = False
+        if not (need_head or need_tail):
+            return _slice(df, start, end)
+
+        parts = []
+        rebuild = False
+        if need_head:
+            parts.append(self.provider.fetch(ticker, start, covered_start - datetime.timedelta(days=1)))
+        #rows after the cached range, overlapping the last cached row to detect re-adjustments.
+        if need_tail:
+            if len(df):
+                tail = self.provider.fetch(ticker, df.index[-1].date(), end)
+                rebuild = _is_readjusted(df, tail)
+            else:
+                tail = self.provider.fetch(ticker, covered_end + datetime.timedelta(days=1), end)
+            parts.append(tail)
+
+        new_start = None if start is None or covered_start is None else min(start, covered_start)
+        new_end = None if end is None and refresh else _max_date(end, covered_end)
+        if rebuild:
+            #re-download at least the whole range the cache covered, never just the part asked for.
+            df = self.provider.fetch(ticker, new_start, new_end)
+        else:
+            df = pd.concat([df] + parts)
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+        self._store(ticker, df, new_start, new_end)
+
+        return _slice(df, start, end)
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.cache_dir, _ticker_key(ticker))
+
+    def _load_meta(self, ticker):
+        """
+        Returns:
+            dict: The cached meta of a ticker, or None if the ticker is not cached.
+        """
+        meta_path = os.path.join(self._ticker_dir(ticker), "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r") as f:
+            return json.load(f)
+
+    def _load_frame(self, ticker, meta, mmap=True):
+        """
+        Reads the cached arrays of a ticker.
+
+        Args:
+            ticker (str): Ticker or dataset code.
+            meta (dict): The ticker's meta, from _load_meta().
+            mmap (bool): If True, memory-map the arrays instead of reading them into memory.
+
+        Returns:
+            pandas.DataFrame: The cached rows.
+        """
+        folder = self._ticker_dir(ticker)
+        #copy-on-write maps keep the files untouched if the caller edits the frame.
+        mmap_mode = "c" if mmap else None
+        dates = np.load(os.path.join(folder, "dates.npy"), mmap_mode=mmap_mode)
+        values = np.load(os.path.join(folder, "values.npy"), mmap_mode=mmap_mode)
+        index = pd.DatetimeIndex(dates, name=meta["index_name"])
+        return pd.DataFrame(values, index=index, columns=meta["columns"], copy=False)
+
+    def _store(self, ticker, df, start, end):
+        """
+        Writes a ticker's rows and covered date range to the cache.
+
+        The covered range is the requested one rather than the first and last row, so
+        holidays at either end are not re-fetched. A start of None is kept as is to mark
+        that the history goes back to the first available row.
+        """
+        folder = self._ticker_dir(ticker)
+        os.makedirs(folder, exist_ok=True)
+        if end is None and len(df):
+            end = df.index[-1].date()
+        meta = {
+            "columns": [str(c) for c in df.columns],
+            "index_name": df.index.name,
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+        }
+        dates = df.index.values.astype("datetime64[ns]")
+        values = np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+        #write to temporary files first so an interrupted run never leaves a half-written cache.
+        _atomic_save(os.path.join(folder, "dates.npy"), dates)
+        _atomic_save(os.path.join(folder, "values.npy"), values)
+        tmp = os.path.join(folder, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(folder, "meta.json"))
+
+
+def _is_readjusted(cached, fetched):
+    """
+    Tells whether the provider's copy of the last cached row differs from the cache.
+
+    Args:
+        cached (pandas.DataFrame): Cached rows.
+        fetched (pandas.DataFrame): Newly fetched rows, starting at the last cached date.
+
+    Returns:
+        bool: True if the cached history must be downloaded again.
+    """
+    last = cached.index[-1]
+    if last not in fetched.index or list(fetched.columns) != list(cached.columns):
+        return True
+    old = cached.loc[last].to_numpy(dtype=np.float64)
+    new = fetched.loc[[last]].iloc[-1].to_numpy(dtype=np.float64)
+    return not np.allclose(old, new, equal_nan=True)
+
+
+def _atomic_save(path, array):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def _slice(df, start, end):
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    return df.loc[start:end]
+
+
+def _ticker_key(ticker):
+    return ticker.replace("/", "_")
+
+
+def _to_date(value):
+    if value is None or (isinstance(value, datetime.date) and not isinstance(value, datetime.datetime)):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def _max_date(a, b):
+    if a is None or b is None:
+        return a or b
+    return max(a, b)
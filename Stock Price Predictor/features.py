@@ -0,0 +1,147 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+DEFAULT_FEATURES = ("close", "lag_0", "lag_1", "lag_2", "return_5", "return_20",
+                    "mean_20", "vol_20", "volume_20")
+
+
+def feature_lookback(name):
+    """
+    Returns how many earlier rows a feature needs before it is defined.
+
+    Supported names:
+        close       'Adj. Close' itself.
+        lag_k       One-day log return, k days ago (lag_0 is today's return).
+        return_k    Log return over the last k days.
+        mean_w      Close relative to its w-day moving average, minus 1.
+        vol_w       Standard deviation of one-day log returns over w days.
+        volume_w    Log of volume relative to its w-day moving average.
+
+    Args:
+        name (str): Feature name.
+
+    Returns:
+        int: Number of rows of history needed.
+    """
+    kind, _, arg = name.partition("_")
+    if kind == "close" and not arg:
+        return 0
+    if not arg.isdigit():
+        raise ValueError(f"Unknown feature: {name}")
+    k = int(arg)
+    if kind == "lag":
+        return k + 1
+    if kind == "return" and k > 0:
+        return k
+    if kind in ("mean", "volume") and k > 0:
+        return k - 1
+    if kind == "vol" and k > 1:
+        return k
+    raise ValueError(f"Unknown feature: {name}")
+
+
+class FeatureStage:
+    """
+    Builds model features from a price history on demand.
+
+    Prices are converted to float32 once; each call to window() then computes only the
+    rows asked for (plus the lookback they need) straight into a preallocated float32
+    array, using strided views for the rolling statistics instead of copying the frame.
+
+    Attributes:
+        names (tuple): Feature names, in column order.
+        lookback (int): First row index for which every feature is defined.
+    """
+
+    def __init__(self, df, names=DEFAULT_FEATURES):
+        """
+        Args:
+            df (pandas.DataFrame): Price history with an 'Adj. Close' column, and an
+                'Adj. Volume' (or 'Volume') column if volume features are used.
+            names (tuple): Feature names, see feature_lookback().
+        """
+        self.names = tuple(names)
+        self.lookback = max(feature_lookback(name) for name in self.names)
+        self._close = df['Adj. Close'].to_numpy(dtype=np.float32)
+        self._volume = None
+        if any(name.startswith("volume_") for name in self.names):
+            column = 'Adj. Volume' if 'Adj. Volume' in df.columns else 'Volume'
+            self._volume = df[column].to_numpy(dtype=np.float32)
+
+    def __len__(self):
+        return len(self._close)
+
+    def window(self, start, stop):
+        """
+        Computes the features of rows start .. stop - 1.
+
+        Args:
+            start (int): First row, at least `lookback`.
+            stop (int): Row after the last one.
+
+        Returns:
+            numpy.ndarray: float32 array of shape (stop - start, len(names)), column-major
+                           so every feature column is contiguous.
+        """
+        stop = min(stop, len(self))
+        if start < self.lookback:
+            raise ValueError(f"Features are defined from row {self.lookback}, not {start}.")
+        out = np.empty((max(stop - start, 0), len(self.names)), dtype=np.float32, order="F")
+        if len(out) == 0:
+            return out
+
+        lb = self.lookback
+        close = self._close[start - lb:stop]
+        size = len(close)
+        log_close = np.log(close)
+        returns = np.diff(log_close)
+        log_volume = None
+
+        for i, name in enumerate(self.names):
+            col = out[:, i]
+            kind, _, arg = name.partition("_")
+            if kind == "close":
+                col[:] = close[lb:]
+            elif kind == "lag":
+                k = int(arg)
+                col[:] = returns[lb - k - 1:size - k - 1]
+            elif kind == "return":
+                k = int(arg)
+                np.subtract(log_close[lb:], log_close[lb - k:size - k], out=col)
+            elif kind == "mean":
+                w = int(arg)
+                np.mean(sliding_window_view(close[lb - w + 1:], w), axis=1, out=col)
+                np.divide(close[lb:], col, out=col)
+                col -= 1
+            elif kind == "vol":
+                w = int(arg)
+                np.std(sliding_window_view(returns[lb - w:], w), axis=1, out=col)
+            elif kind == "volume":
+                w = int(arg)
+                if log_volume is None:
+                    #+1 keeps days without trading finite.
+                    log_volume = np.log1p(self._volume[start - lb:stop])
+                np.mean(sliding_window_view(log_volume[lb - w + 1:], w), axis=1, out=col)
+                np.subtract(log_volume[lb:], col, out=col)
+        return out
+
+    def matrix(self):
+        """
+        Returns:
+            numpy.ndarray: Features of every row from `lookback` to the end.
+        """
+        return self.window(self.lookback, len(self))
+
+    def iter_windows(self, size):
+        """
+        Yields the features in consecutive blocks of rows, so a long history never has to
+        be held as one full feature matrix.
+
+        Args:
+            size (int): Rows per block.
+
+        Yields:
+            tuple: (start row, float32 feature block).
+        """
+        for start in range(self.lookback, len(self), size):
+            yield start, self.window(start, start + size)
@@ -1,17 +1,19 @@
-import quandl
+import os
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 import datetime
 
-from sklearn.model_selection import train_test_split
-from sklearn import preprocessing
-from sklearn.linear_model import LinearRegression
+from data import PriceCache, QuandlProvider, LocalFileProvider
+from model import train_and_forecast
 
-quandl.ApiConfig.api_key = 'UYrwaU6DnBqNxzG6LmG3'
+#set STOCK_DATA_DIR to a folder of "<ticker>.csv" files to run without quandl.
+if os.environ.get("STOCK_DATA_DIR"):
+    provider = LocalFileProvider(os.environ["STOCK_DATA_DIR"])
+else:
+    provider = QuandlProvider('UYrwaU6DnBqNxzG6LmG3')
+cache = PriceCache('./Price Cache/', provider)
 
-
-df = quandl.get("WIKI/NKE")
+df = cache.get("WIKI/NKE")
 df = df[['Adj. Close']]
 print(df)
 
@@ -20,25 +22,7 @@ plt.legend(loc='upper left')
 plt.show()
 
 forecast = 30
-df['Prediction'] = df[['Adj. Close']].shift(-forecast)
-
-X = np.array(df.drop(['Prediction'], 1))
-X = preprocessing.scale(X)
-
-X_forecast = X[-forecast:]
-X = X[:-forecast]
-
-y = np.array(df['Prediction'])
-y = y[:-forecast]
-
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
-
-clf = LinearRegression()
-clf.fit(X_train, y_train)
-
-confidence = clf.score(X_test, y_test)
-
-forecast_predicted = clf.predict(X_forecast)
+forecast_predicted, confidence = train_and_forecast(df, forecast)
 print(forecast_predicted)
 
 dates = pd.date_range(start="2018-03-28", end='2018-04-26')
@@ -0,0 +1,80 @@
+import numpy as np
+
+from sklearn.model_selection import train_test_split
+from sklearn import preprocessing
+from sklearn.linear_model import LinearRegression
+
+from features import FeatureStage
+
+
+def prepare_data(df, forecast=30, features=None):
+    """
+    Builds the training set and the forecast inputs from a price history.
+
+    Each row's target is the 'Adj. Close' price `forecast` days later, so the last
+    `forecast` rows have no target and become the inputs of the forecast.
+
+    Args:
+        df (pandas.DataFrame): Price history with an 'Adj. Close' column.
+        forecast (int): Number of days to predict ahead.
+        features (tuple): Feature names (see features.py), or None to use 'Adj. Close' only.
+
+    Returns:
+        tuple: (X, y, X_forecast) as NumPy arrays, with X and X_forecast scaled together.
+    """
+    close = df['Adj. Close'].to_numpy()
+    stage = FeatureStage(df, features) if features else None
+    if stage is not None:
+        #rows before the lookback have undefined features and are left out.
+        close = close[stage.lookback:]
+    #checked before building anything, so short histories do not scale empty arrays.
+    if len(close) <= forecast:
+        raise ValueError(f"Need more than {forecast} usable rows of history, got {len(close)}.")
+
+    if stage is not None:
+        X = stage.matrix()
+        _scale_inplace(X)
+    else:
+        X = preprocessing.scale(close.reshape(-1, 1))
+
+    X_forecast = X[-forecast:]
+    X = X[:-forecast]
+    y = close[forecast:]
+    return X, y, X_forecast
+
+
+def train_and_forecast(df, forecast=30, test_size=0.2, random_state=None, features=None):
+    """
+    Fits a linear regression on a price history and predicts the next `forecast` days.
+
+    Args:
+        df (pandas.DataFrame): Price history with an 'Adj. Close' column.
+        forecast (int): Number of days to predict ahead.
+        test_size (float): Share of the rows held out to score the model.
+        random_state (int): Seed of the train/test split, or None for a random split.
+        features (tuple): Feature names (see features.py), or None to use 'Adj. Close' only.
+
+    Returns:
+        tuple: (forecast_predicted, confidence) where forecast_predicted is a NumPy array
+               of `forecast` prices and confidence is the R^2 score on the held-out rows.
+    """
+    X, y, X_forecast = prepare_data(df, forecast, features)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size,
+                                                        random_state=random_state)
+
+    clf = LinearRegression()
+    clf.fit(X_train, y_train)
+
+    confidence = clf.score(X_test, y_test)
+    forecast_predicted = clf.predict(X_forecast)
+    return np.asarray(forecast_predicted), confidence
+
+
+def _scale_inplace(X):
+    #same result as preprocessing.scale, but keeps float32 features in place; sklearn's
+    #version warns on float32 input because its float64 tolerance check cannot be met.
+    mean = X.mean(axis=0, dtype=np.float64)
+    std = X.std(axis=0, dtype=np.float64)
+    std[std == 0] = 1.0
+    X -= mean.astype(X.dtype)
+    X /= std.astype(X.dtype)
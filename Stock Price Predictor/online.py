@@ -0,0 +1,217 @@
+import os
+import json
+from collections import deque
+
+import numpy as np
+
+
+class OnlineForecaster:
+    """
+    Linear regression forecaster that is updated one daily bar at a time.
+
+    Instead of refitting on the whole history, the model keeps running means and
+    co-moments of the (today's close, close `forecast` days later) pairs, which are the
+    sufficient statistics of a one-feature least squares fit. Appending a bar updates
+    them in O(1) and gives exactly the same coefficients as refitting LinearRegression
+    on the full history. The running mean and variance of every close seen are kept as
+    well, matching what preprocessing.scale would compute over the full history.
+
+    Attributes:
+        forecast (int): Number of days predicted ahead.
+        n (int): Number of training pairs seen.
+        mean_x (float): Mean of the input closes of the training pairs.
+        mean_y (float): Mean of the target closes of the training pairs.
+        c_xx (float): Sum of squared deviations of the inputs.
+        c_xy (float): Sum of input/target deviation products.
+        c_yy (float): Sum of squared deviations of the targets.
+        scale_n (int): Number of closes seen by the scaler.
+        scale_mean (float): Running mean of all closes.
+        scale_m2 (float): Running sum of squared deviations of all closes.
+        pending (deque): Last `forecast` closes, whose targets are not known yet.
+        last_date (str): ISO date of the last bar seen, or None.
+    """
+
+    def __init__(self, forecast=30):
+        """
+        Args:
+            forecast (int): Number of days to predict ahead.
+        """
+        self.forecast = forecast
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.c_xx = 0.0
+        self.c_xy = 0.0
+        self.c_yy = 0.0
+        self.scale_n = 0
+        self.scale_mean = 0.0
+        self.scale_m2 = 0.0
+        self.pending = deque()
+        self.last_date = None
+
+    @classmethod
+    def from_history(cls, closes, forecast=30, last_date=None):
+        """
+        Builds the model state from a full price history in one vectorized pass.
+
+        Args:
+            closes (array-like): 'Adj. Close' prices, oldest first.
+            forecast (int): Number of days to predict ahead.
+            last_date (str): ISO date of the last close, or None.
+
+        Returns:
+            OnlineForecaster: Model ready to forecast and to take new bars.
+        """
+        model = cls(forecast)
+        closes = np.asarray(closes, dtype=np.float64)
+        x = closes[:-forecast]
+        y = closes[forecast:]
+        if len(x):
+            model.n = len(x)
+            model.mean_x = float(x.mean())
+            model.mean_y = float(y.mean())
+            dx = x - model.mean_x
+            dy = y - model.mean_y
+            model.c_xx = float(dx @ dx)
+            model.c_xy = float(dx @ dy)
+            model.c_yy = float(dy @ dy)
+        if len(closes):
+            model.scale_n = len(closes)
+            model.scale_mean = float(closes.mean())
+            model.scale_m2 = float(((closes - model.scale_mean) ** 2).sum())
+        model.pending = deque(float(c) for c in closes[-forecast:])
+        model.last_date = last_date
+        return model
+
+    def update(self, close, date=None):
+        """
+        Appends one daily close and updates the model in O(1).
+
+        The close becomes the target of the bar `forecast` days earlier, which completes
+        one more training pair.
+
+        Args:
+            close (float): New 'Adj. Close' price.
+            date (str): ISO date of the bar, or None.
+        """
+        close = float(close)
+        #scaler statistics (Welford).
+        self.scale_n += 1
+        delta = close - self.scale_mean
+        self.scale_mean += delta / self.scale_n
+        self.scale_m2 += delta * (close - self.scale_mean)
+
+        self.pending.append(close)
+        if len(self.pending) > self.forecast:
+            x = self.pending.popleft()
+            y = close
+            self.n += 1
+            dx = x - self.mean_x
+            dy = y - self.mean_y
+            self.mean_x += dx / self.n
+            self.mean_y += dy / self.n
+            self.c_xx += dx * (x - self.mean_x)
+            self.c_xy += dx * (y - self.mean_y)
+            self.c_yy += dy * (y - self.mean_y)
+        if date is not None:
+            self.last_date = date
+
+    def coefficients(self):
+        """
+        Returns:
+            tuple: (slope, intercept) of the fitted line on unscaled closes.
+        """
+        if self.n < 2 or self.c_xx == 0:
+            raise ValueError("Not enough varied history to fit the model.")
+        slope = self.c_xy / self.c_xx
+        return slope, self.mean_y - slope * self.mean_x
+
+    def scaler(self):
+        """
+        Returns:
+            tuple: (mean, std) of all closes seen, as used by preprocessing.scale.
+        """
+        if self.scale_n == 0:
+            return 0.0, 1.0
+        std = (self.scale_m2 / self.scale_n) ** 0.5
+        return self.scale_mean, std if std > 0 else 1.0
+
+    def predict(self):
+        """
+        Predicts the next `forecast` closes from the pending bars.
+
+        Returns:
+            numpy.ndarray: Predicted prices, one per pending bar.
+        """
+        slope, intercept = self.coefficients()
+        return intercept + slope * np.fromiter(self.pending, dtype=np.float64, count=len(self.pending))
+
+    def score(self):
+        """
+        Returns:
+            float: In-sample R^2 of the fit over all training pairs seen.
+        """
+        if self.c_xx == 0 or self.c_yy == 0:
+            return 0.0
+        return self.c_xy * self.c_xy / (self.c_xx * self.c_yy)
+
+    def to_dict(self):
+        state = {key: getattr(self, key) for key in _STATE_FIELDS}
+        state["pending"] = list(self.pending)
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        model = cls(state["forecast"])
+        for key in _STATE_FIELDS:
+            setattr(model, key, state[key])
+        model.pending = deque(state["pending"])
+        return model
+
+    def save(self, file_path):
+        """
+        Writes the model state to a JSON file.
+
+        Args:
+            file_path (str): Output path.
+        """
+        tmp = file_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, file_path)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Reads a model state written by save().
+
+        Args:
+            file_path (str): Path of the JSON file.
+
+        Returns:
+            OnlineForecaster: The restored model.
+        """
+        with open(file_path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+_STATE_FIELDS = ("forecast", "n", "mean_x", "mean_y", "c_xx", "c_xy", "c_yy",
+                 "scale_n", "scale_mean", "scale_m2", "last_date")
+
+
+def update_from_frame(model, df):
+    """
+    Feeds the bars of a price history that are newer than the model's last bar.
+
+    Args:
+        model (OnlineForecaster): Model to update.
+        df (pandas.DataFrame): Price history with an 'Adj. Close' column, indexed by date.
+
+    Returns:
+        int: Number of bars appended.
+    """
+    if model.last_date is not None:
+        df = df.loc[df.index > model.last_date]
+    for date, close in zip(df.index, df['Adj. Close'].to_numpy()):
+        model.update(close, date.date().isoformat())
+    return len(df)
@@ -0,0 +1,212 @@
+import os
+import csv
+import argparse
+import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from data import PriceCache, QuandlProvider, LocalFileProvider, read_tickers
+from model import train_and_forecast
+from online import OnlineForecaster, update_from_frame
+from features import DEFAULT_FEATURES, feature_lookback
+
+#each worker process opens the cache once and reuses it for all of its tickers.
+_cache = None
+
+
+def _init_worker(cache_dir, provider):
+    global _cache
+    _cache = PriceCache(cache_dir, provider)
+
+
+def run_ticker(ticker, forecast=30, test_size=0.2, refresh=False, plot_dir=None, state_dir=None,
+               features=None):
+    """
+    Loads a ticker's prices from the worker's cache, fits the model and forecasts.
+
+    With a state folder, the ticker's OnlineForecaster is loaded from it instead, fed only
+    the bars newer than its last update and saved back; the confidence is then the
+    in-sample R^2 since there is no held-out split.
+
+    Args:
+        ticker (str): Ticker or dataset code.
+        forecast (int): Number of days to predict ahead.
+        test_size (float): Share of the rows held out to score the model.
+        refresh (bool): If True, fetch rows newer than the cached range first.
+        plot_dir (str): Folder to save a forecast chart to, or None to skip plotting.
+        state_dir (str): Folder of online model states, or None to refit from scratch.
+        features (tuple): Feature names (see features.py), or None to use 'Adj. Close' only.
+
+    Returns:
+        dict: ticker, last_date, confidence, forecast (list of prices) and error (None on success).
+    """
+    try:
+        df = _cache.get(ticker, refresh=refresh)
+        if state_dir:
+            forecast_predicted, confidence = _run_online(ticker, df, forecast, state_dir)
+        else:
+            forecast_predicted, confidence = train_and_forecast(df, forecast, test_size, features=features)
+        if plot_dir:
+            save_plot(df, forecast_predicted, os.path.join(plot_dir, ticker.replace("/", "_") + ".png"))
+        return {
+            "ticker": ticker,
+            "last_date": df.index[-1].date().isoformat(),
+            "confidence": confidence,
+            "forecast": list(forecast_predicted),
+            "error": None,
+        }
+    except Exception as e:
+        #one bad ticker must not abort a nightly run over thousands of symbols.
+        return {"ticker": ticker, "last_date": None, "confidence": None, "forecast": [],
+                "error": f"{type(e).__name__}: {e}"}
+
+
+def _run_online(ticker, df, forecast, state_dir):
+    state_path = os.path.join(state_dir, ticker.replace("/", "_") + ".json")
+    model = None
+    if os.path.exists(state_path):
+        model = OnlineForecaster.load(state_path)
+        if model.forecast != forecast:
+            raise ValueError(f"Saved state forecasts {model.forecast} days, not {forecast}.")
+        #a split or dividend re-adjusts the whole history; the saved statistics are then stale.
+        if not _matches_history(model, df):
+            model = None
+    if model is not None:
+        update_from_frame(model, df)
+    else:
+        model = OnlineForecaster.from_history(df['Adj. Close'].to_numpy(), forecast,
+                                              df.index[-1].date().isoformat())
+    model.save(state_path)
+    return model.predict(), model.score()
+
+
+def _matches_history(model, df):
+    if model.last_date is None or not model.pending:
+        return False
+    close = df['Adj. Close']
+    last = close.loc[close.index <= model.last_date]
+    return len(last) > 0 and abs(last.iloc[-1] - model.pending[-1]) <= 1e-9 * abs(model.pending[-1])
+
+
+def save_plot(df, forecast_predicted, file_path):
+    """
+    Saves the price history and the forecast as a PNG chart, without opening a window.
+
+    Args:
+        df (pandas.DataFrame): Price history with an 'Adj. Close' column.
+        forecast_predicted (numpy.ndarray): Predicted prices for the following business days.
+        file_path (str): Output PNG path.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    dates = pd.bdate_range(start=df.index[-1] + pd.Timedelta(days=1), periods=len(forecast_predicted))
+    fig, ax = plt.subplots(figsize=(15, 6))
+    df['Adj. Close'].plot(ax=ax, color='g')
+    ax.plot(dates, forecast_predicted, color='y')
+    ax.set_xlim(left=df.index[-1] - pd.Timedelta(days=365))
+    fig.savefig(file_path)
+    plt.close(fig)
+
+
+def run_pipeline(tickers, output, cache_dir, provider, forecast=30, test_size=0.2,
+                 workers=None, refresh=False, plot_dir=None, state_dir=None, features=None):
+    """
+    Trains and forecasts every ticker across a process pool and writes the results to a CSV file.
+
+    Rows are written as tickers finish, so partial results survive an interrupted run.
+    Columns are ticker, last_date, confidence, error and day_1 .. day_<forecast>.
+
+    Args:
+        tickers (list): Tickers to process.
+        output (str): Path of the results CSV file.
+        cache_dir (str): Root folder of the price cache.
+        provider: Data source used to fill the cache.
+        forecast (int): Number of days to predict ahead.
+        test_size (float): Share of the rows held out to score each model.
+        workers (int): Number of worker processes, or None for one per CPU.
+        refresh (bool): If True, fetch rows newer than the cached range for every ticker.
+        plot_dir (str): Folder to save forecast charts to, or None to skip plotting.
+        state_dir (str): Folder of online model states, or None to refit every ticker from scratch.
+        features (tuple): Feature names (see features.py), or None to use 'Adj. Close' only.
+
+    Returns:
+        tuple: (number of tickers processed, number of failures).
+    """
+    if state_dir and features:
+        raise ValueError("Online models only support the 'Adj. Close' feature.")
+    for folder in (plot_dir, state_dir):
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+    fieldnames = ["ticker", "last_date", "confidence", "error"] + [f"day_{i + 1}" for i in range(forecast)]
+    failures = 0
+
+    with open(output, "w", newline="") as f, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(cache_dir, provider)) as executor:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        futures = [executor.submit(run_ticker, ticker, forecast, test_size, refresh, plot_dir,
+                                   state_dir, features)
+                   for ticker in tickers]
+        for future in as_completed(futures):
+            result = future.result()
+            row = {key: result[key] for key in ("ticker", "last_date", "confidence", "error")}
+            for i, price in enumerate(result["forecast"]):
+                row[f"day_{i + 1}"] = price
+            writer.writerow(row)
+            if result["error"]:
+                failures += 1
+                print(f"{result['ticker']}: {result['error']}")
+
+    return len(tickers), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast many tickers in parallel without any GUI.")
+    parser.add_argument("tickers", help="File with one ticker per line, e.g. WIKI/NKE.")
+    parser.add_argument("-o", "--output", default="forecasts.csv", help="Results CSV file.")
+    parser.add_argument("--forecast", type=int, default=30, help="Days to predict ahead.")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Share of rows used to score the model.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU).")
+    parser.add_argument("--cache-dir", default="./Price Cache/", help="Price cache folder.")
+    parser.add_argument("--data-dir", default=None, help="Read '<ticker>.csv' files from this folder instead of quandl.")
+    parser.add_argument("--api-key", default=os.environ.get("QUANDL_API_KEY"), help="Quandl API key.")
+    parser.add_argument("--refresh", action="store_true", help="Fetch rows newer than the cache.")
+    parser.add_argument("--plot-dir", default=None, help="Save a forecast chart per ticker to this folder.")
+    parser.add_argument("--state-dir", default=None,
+                        help="Keep online models in this folder and only feed them new bars.")
+    parser.add_argument("--features", default=None,
+                        help="Comma separated feature names, e.g. close,lag_0,mean_20,vol_20 "
+                             "('default' for the standard set).")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        provider = LocalFileProvider(args.data_dir)
+    else:
+        provider = QuandlProvider(args.api_key)
+
+    features = None
+    if args.features == "default":
+        features = DEFAULT_FEATURES
+    elif args.features:
+        features = tuple(name.strip() for name in args.features.split(","))
+        #fail on typos before any worker starts.
+        for name in features:
+            feature_lookback(name)
+
+    tickers = read_tickers(args.tickers)
+    start = datetime.datetime.now()
+    total, failures = run_pipeline(tickers, args.output, args.cache_dir, provider,
+                                   forecast=args.forecast, test_size=args.test_size,
+                                   workers=args.workers, refresh=args.refresh,
+                                   plot_dir=args.plot_dir, state_dir=args.state_dir,
+                                   features=features)
+    elapsed = (datetime.datetime.now() - start).total_seconds()
+    print(f"Processed {total} tickers ({failures} failed) in {elapsed:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
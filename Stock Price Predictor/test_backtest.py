@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from backtest import walk_forward
+
+
+def _history(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({'Adj. Close': close}, index=pd.bdate_range("1990-01-01", periods=n))
+
+
+def _check_windows(df, forecast, train_window, step, expanding):
+    results = walk_forward(df, forecast, train_window, step, expanding)
+    close = df['Adj. Close'].to_numpy()
+    X = close[:-forecast].reshape(-1, 1)
+    y = close[forecast:]
+    assert len(results) > 10
+
+    for k in range(len(results)):
+        train_end = train_window + k * step
+        train_start = 0 if expanding else train_end - train_window
+        clf = LinearRegression().fit(X[train_start:train_end], y[train_start:train_end])
+        assert np.isclose(results.slope.iloc[k], clf.coef_[0])
+        assert np.isclose(results.intercept.iloc[k], clf.intercept_)
+
+        test_start = train_end + forecast - 1
+        predicted = clf.predict(X[test_start:test_start + step])
+        error = y[test_start:test_start + step] - predicted
+        assert np.isclose(results.mae.iloc[k], np.abs(error).mean())
+        assert np.isclose(results.rmse.iloc[k], np.sqrt((error ** 2).mean()))
+
+
+def test_rolling_windows_match_one_fit_per_window():
+    _check_windows(_history(3000), forecast=30, train_window=500, step=21, expanding=False)
+
+
+def test_expanding_windows_match_one_fit_per_window():
+    _check_windows(_history(3000, seed=1), forecast=30, train_window=500, step=21, expanding=True)
+
+
+def test_training_stops_before_first_test_target():
+    df = _history(1000, seed=2)
+    results = walk_forward(df, forecast=30, train_window=300, step=10)
+    #the last training target (train_end + 30 rows) must not come after the first test input.
+    positions = df.index.get_indexer(results.train_end) + 30
+    assert (positions <= df.index.get_indexer(results.index)).all()
@@ -0,0 +1,121 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from data import LocalFileProvider, PriceCache
+
+
+class CountingProvider(LocalFileProvider):
+    """LocalFileProvider that records the date range of every fetch."""
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.calls = []
+
+    def fetch(self, ticker, start=None, end=None):
+        self.calls.append((start, end))
+        return super().fetch(ticker, start, end)
+
+
+def _history(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    index = pd.bdate_range("2020-01-01", periods=n, name="Date")
+    return pd.DataFrame({"Adj. Close": close, "Adj. Volume": rng.integers(1000, 5000, n)}, index=index)
+
+
+def _write(folder, df):
+    df.to_csv(folder / "WIKI_TEST.csv")
+
+
+def _assert_rows(actual, expected):
+    #the CSV round trip changes the dtypes and the datetime resolution, not the values.
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_index_type=False,
+                                  check_freq=False)
+
+
+def _day(df, i):
+    return df.index[i].date()
+
+
+def _cache(tmp_path, df):
+    source = tmp_path / "source"
+    source.mkdir()
+    _write(source, df)
+    provider = CountingProvider(str(source))
+    return PriceCache(str(tmp_path / "cache"), provider), provider, source
+
+
+def test_head_fetch_only_requests_missing_rows(tmp_path):
+    df = _history(100)
+    cache, provider, _ = _cache(tmp_path, df)
+    cache.get("WIKI/TEST", _day(df, 50), _day(df, 99))
+
+    result = cache.get("WIKI/TEST", _day(df, 10), _day(df, 99))
+    assert provider.calls[-1] == (_day(df, 10), _day(df, 50) - datetime.timedelta(days=1))
+    _assert_rows(result, df.iloc[10:])
+
+    provider.calls.clear()
+    cache.get("WIKI/TEST", _day(df, 20), _day(df, 80))
+    assert provider.calls == []
+
+
+def test_refresh_appends_rows_after_overlapping_row(tmp_path):
+    full = _history(100)
+    cache, provider, source = _cache(tmp_path, full.iloc[:60])
+    cache.get("WIKI/TEST")
+
+    _write(source, full)
+    result = cache.get("WIKI/TEST", refresh=True)
+    assert provider.calls[-1] == (_day(full, 59), None)
+    assert len(provider.calls) == 2
+    _assert_rows(result, full)
+
+
+def test_readjusted_history_is_downloaded_again(tmp_path):
+    full = _history(100)
+    cache, provider, source = _cache(tmp_path, full.iloc[:60])
+    cache.get("WIKI/TEST")
+
+    #a dividend rescales every adjusted price before it.
+    adjusted = full.copy()
+    adjusted["Adj. Close"] *= 0.98
+    _write(source, adjusted)
+    result = cache.get("WIKI/TEST", refresh=True)
+    assert provider.calls[-1] == (None, None)
+    _assert_rows(result, adjusted)
+
+    provider.calls.clear()
+    _assert_rows(cache.get("WIKI/TEST"), adjusted)
+    assert provider.calls == []
+
+
+def test_refresh_with_earlier_end_keeps_cache(tmp_path):
+    df = _history(100)
+    cache, provider, _ = _cache(tmp_path, df)
+    cache.get("WIKI/TEST")
+
+    result = cache.get("WIKI/TEST", end=_day(df, 40), refresh=True)
+    _assert_rows(result, df.iloc[:41])
+
+    provider.calls.clear()
+    _assert_rows(cache.get("WIKI/TEST"), df)
+    assert provider.calls == []
+
+
+def test_rebuild_keeps_rows_after_requested_end(tmp_path):
+    full = _history(100)
+    cache, provider, source = _cache(tmp_path, full.iloc[:60])
+    cache.get("WIKI/TEST")
+
+    adjusted = full.copy()
+    adjusted["Adj. Close"] *= 0.98
+    _write(source, adjusted)
+    result = cache.get("WIKI/TEST", end=_day(full, 80))
+    _assert_rows(result, adjusted.iloc[:81])
+
+    provider.calls.clear()
+    result = cache.get("WIKI/TEST", end=_day(full, 70))
+    _assert_rows(result, adjusted.iloc[:71])
+    assert provider.calls == []
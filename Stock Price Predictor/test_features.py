@@ -0,0 +1,64 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import DEFAULT_FEATURES, FeatureStage
+from model import prepare_data
+
+
+def _history(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    volume = rng.integers(0, 100000, n).astype(float)
+    return pd.DataFrame({'Adj. Close': close, 'Adj. Volume': volume},
+                        index=pd.bdate_range("1990-01-01", periods=n))
+
+
+def _reference(df, name):
+    close = df['Adj. Close']
+    returns = np.log(close).diff()
+    kind, _, arg = name.partition("_")
+    if kind == "close":
+        return close
+    k = int(arg)
+    if kind == "lag":
+        return returns.shift(k)
+    if kind == "return":
+        return np.log(close) - np.log(close.shift(k))
+    if kind == "mean":
+        return close / close.rolling(k).mean() - 1
+    if kind == "vol":
+        return returns.rolling(k).std(ddof=0)
+    log_volume = np.log1p(df['Adj. Volume'])
+    return log_volume - log_volume.rolling(k).mean()
+
+
+@pytest.mark.parametrize("names", [DEFAULT_FEATURES, ("lag_4", "mean_3", "vol_2", "volume_1")])
+def test_features_match_pandas(names):
+    df = _history(500)
+    stage = FeatureStage(df, names)
+    expected = np.column_stack([_reference(df, name).to_numpy() for name in names])
+    assert not np.isnan(expected[stage.lookback:]).any()
+    if stage.lookback:
+        assert np.isnan(expected[stage.lookback - 1]).any()
+
+    matrix = stage.matrix()
+    assert matrix.dtype == np.float32
+    assert np.allclose(matrix, expected[stage.lookback:], rtol=1e-4, atol=1e-5)
+
+    #blocks that do not divide the history evenly must still cover it exactly.
+    blocks = list(stage.iter_windows(37))
+    assert [start for start, _ in blocks] == list(range(stage.lookback, len(df), 37))
+    assert np.array_equal(np.vstack([block for _, block in blocks]), matrix)
+
+
+def test_short_history_raises_without_warnings():
+    df = _history(15)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with pytest.raises(ValueError, match="usable rows"):
+            prepare_data(df, forecast=5, features=DEFAULT_FEATURES)
+        with pytest.raises(ValueError, match="usable rows"):
+            prepare_data(df.iloc[:5], forecast=5)
@@ -0,0 +1,58 @@
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+from online import OnlineForecaster
+
+
+def _prices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def _sklearn_fit(close, forecast):
+    X = close[:-forecast].reshape(-1, 1)
+    y = close[forecast:]
+    return LinearRegression().fit(X, y), X, y
+
+
+def test_from_history_matches_linear_regression():
+    close = _prices(2000)
+    model = OnlineForecaster.from_history(close, 30)
+    clf, X, y = _sklearn_fit(close, 30)
+
+    slope, intercept = model.coefficients()
+    assert np.isclose(slope, clf.coef_[0])
+    assert np.isclose(intercept, clf.intercept_)
+    assert np.isclose(model.score(), clf.score(X, y))
+    assert np.allclose(model.predict(), clf.predict(close[-30:].reshape(-1, 1)))
+
+
+def test_updates_match_refit_on_full_history():
+    close = _prices(2000, seed=1)
+    model = OnlineForecaster.from_history(close[:1500], 30)
+    for price in close[1500:]:
+        model.update(price)
+    clf, X, y = _sklearn_fit(close, 30)
+
+    slope, intercept = model.coefficients()
+    assert model.n == len(X)
+    assert np.isclose(slope, clf.coef_[0])
+    assert np.isclose(intercept, clf.intercept_)
+    assert np.allclose(model.predict(), clf.predict(close[-30:].reshape(-1, 1)))
+    #the running scaler sees every close, like preprocessing.scale over the full history.
+    mean, std = model.scaler()
+    assert np.isclose(mean, close.mean())
+    assert np.isclose(std, close.std())
+
+
+def test_save_and_load_round_trip(tmp_path):
+    close = _prices(500, seed=2)
+    model = OnlineForecaster.from_history(close, 30, "2018-03-27")
+    path = str(tmp_path / "state.json")
+    model.save(path)
+    restored = OnlineForecaster.load(path)
+
+    restored.update(close[-1] * 1.01, "2018-03-28")
+    model.update(close[-1] * 1.01, "2018-03-28")
+    assert restored.last_date == "2018-03-28"
+    assert np.allclose(restored.predict(), model.predict())